@@ -6,8 +6,11 @@ Unterstützt verschiedene Syntax-Stile und behält Kommentare und Formatierung b
 
 import re
 import os
+import shutil
+import stat
+import tempfile
 from typing import Dict, List, Optional, Tuple, Union, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -19,7 +22,7 @@ class VariableStyle(Enum):
     SETENV = "setenv"      # setenv VAR value (csh/tcsh)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigVariable:
     """Repräsentiert eine Variable in der Konfigurationsdatei"""
     name: str
@@ -30,27 +33,27 @@ class ConfigVariable:
     leading_whitespace: str = ""
     inline_comment: Optional[str] = None
     quote_char: str = ""  # ', ", oder leer
-    
+
+    # Stil-abhängige Bestandteile der Ausgabezeile; setenv trennt mit
+    # Leerzeichen statt '='
+    _PREFIX = {
+        VariableStyle.BASH: '',
+        VariableStyle.EXPORT: 'export ',
+        VariableStyle.DECLARE: 'declare -x ',
+        VariableStyle.SETENV: 'setenv ',
+    }
+    _SEP = {VariableStyle.SETENV: ' '}
+
     def __str__(self) -> str:
         """Gibt die Variable in der ursprünglichen Form zurück"""
-        if self.inline_comment:
-            comment_part = f"  # {self.inline_comment}"
-        else:
-            comment_part = ""
-        
-        value = self.value
-        if self.quote_char:
-            value = f"{self.quote_char}{value}{self.quote_char}"
-        
-        if self.style == VariableStyle.BASH:
-            return f"{self.leading_whitespace}{self.name}={value}{comment_part}"
-        elif self.style == VariableStyle.EXPORT:
-            return f"{self.leading_whitespace}export {self.name}={value}{comment_part}"
-        elif self.style == VariableStyle.DECLARE:
-            return f"{self.leading_whitespace}declare -x {self.name}={value}{comment_part}"
-        elif self.style == VariableStyle.SETENV:
-            return f"{self.leading_whitespace}setenv {self.name} {value}{comment_part}"
-    
+        # Bei jedem Aufruf über den aktuellen Stil dispatchen, damit auch
+        # direkte Zuweisungen an style sofort wirken
+        return _RENDERERS[self.style](self)
+
+    def __bytes__(self) -> bytes:
+        """Gibt die Ausgabezeile als UTF-8-Bytes zurück"""
+        return str(self).encode('utf-8')
+
     def get_unquoted_value(self) -> str:
         """Gibt den Wert ohne Anführungszeichen zurück"""
         if self.quote_char and self.value.startswith(self.quote_char) and self.value.endswith(self.quote_char):
@@ -64,27 +67,121 @@ class ConfigVariable:
             self.quote_char = quote_char
 
 
-@dataclass
+# Pro Stil eine spezialisierte Render-Funktion, bei Modul-Import aus einem
+# f-String-Template kompiliert: Präfix und Trennzeichen stehen als Literale
+# im Funktionskörper, sodass beim Rendern weder verzweigt noch nachgeschlagen
+# werden muss. Ein leeres quote_char lässt den Wert unverändert.
+_RENDERERS = {}
+for _style, _prefix in ConfigVariable._PREFIX.items():
+    _sep = ConfigVariable._SEP.get(_style, '=')
+    _ns = {}
+    exec(
+        "def _render(v):\n"
+        "    return (f\"{v.leading_whitespace}" + _prefix + "{v.name}" + _sep +
+        "{v.quote_char}{v.value}{v.quote_char}\"\n"
+        "            + (f\"  # {v.inline_comment}\" if v.inline_comment else \"\"))\n",
+        _ns
+    )
+    _RENDERERS[_style] = _ns['_render']
+del _style, _prefix, _sep, _ns
+
+
+@dataclass(slots=True)
 class ConfigComment:
     """Repräsentiert einen Kommentar in der Konfigurationsdatei"""
     content: str
     line_number: int
     raw_line: str
     is_inline: bool = False
-    
+    # Einmal beim Anlegen gestrippte Ausgabezeile; erspart das rstrip()
+    # bei jedem to_string()/save()-Durchlauf
+    _rendered: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._rendered = self.raw_line.rstrip()
+
     def __str__(self) -> str:
-        return self.raw_line.rstrip()
+        return self._rendered
+
+    def __bytes__(self) -> bytes:
+        return str(self).encode('utf-8')
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigEmptyLine:
     """Repräsentiert eine leere Zeile in der Konfigurationsdatei"""
     line_number: int
     raw_line: str = ""
-    
+
     def __str__(self) -> str:
         return ""
 
+    def __bytes__(self) -> bytes:
+        return b""
+
+
+@dataclass(slots=True)
+class ConfigRawLine:
+    """Repräsentiert eine Zeile ohne erkannte Syntax; wird unverändert erhalten"""
+    line_number: int
+    raw_line: str
+
+    def __str__(self) -> str:
+        return self.raw_line
+
+    def __bytes__(self) -> bytes:
+        return str(self).encode('utf-8')
+
+
+# Matcht den Wert-Teil vor dem ersten ungequoteten '#': Escape-Sequenzen und
+# vollständig gequotete Abschnitte werden übersprungen, alles andere bis zum
+# nächsten Sonderzeichen in einem Stück konsumiert.
+_VALUE_RE = re.compile(r"(?:\\.|'[^']*'|\"[^\"]*\"|[^#\\'\"])*")
+
+# Gültige Bash-Variablennamen (einmal kompiliert statt pro Aufruf)
+_NAME_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+# Zuordnung Präfix -> Stil für das kombinierte Pattern (Präfix normalisiert
+# auf das erste Wort, kein Präfix -> BASH)
+_STYLE_BY_PREFIX = {
+    None: VariableStyle.BASH,
+    'export': VariableStyle.EXPORT,
+    'declare': VariableStyle.DECLARE,
+    'setenv': VariableStyle.SETENV,
+}
+
+# Optionale Numba-Beschleunigung: Numba ist keine Abhängigkeit dieses Pakets;
+# ist es installiert (z.B. in Deployment-Scannern, die tausende Dateien
+# parsen), wird der Byte-Scanner zu Maschinencode kompiliert, sonst greift
+# der Regex-Pfad in _split_value_and_comment.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+if _njit is not None:
+    @_njit(cache=True)
+    def _scan_unquoted_hash(buf):
+        """Gibt den Index des ersten ungequoteten '#' zurück, sonst -1"""
+        in_single_quote = False
+        in_double_quote = False
+        escaped = False
+        for i in range(len(buf)):
+            char = buf[i]
+            if escaped:
+                escaped = False
+            elif char == 92:  # '\\'
+                escaped = True
+            elif char == 39 and not in_double_quote:  # "'"
+                in_single_quote = not in_single_quote
+            elif char == 34 and not in_single_quote:  # '"'
+                in_double_quote = not in_double_quote
+            elif char == 35 and not in_single_quote and not in_double_quote:  # '#'
+                return i
+        return -1
+else:
+    _scan_unquoted_hash = None
+
 
 class BashConfigParser:
     """
@@ -92,179 +189,330 @@ class BashConfigParser:
     Behält Kommentare, Leerzeilen und Formatierung bei.
     """
     
-    # Regex-Patterns für verschiedene Variablendefinitionen
-    PATTERNS = {
-        VariableStyle.BASH: re.compile(r'^(\s*)([A-Za-z_][A-Za-z0-9_\.]*)\s*=\s*(.*?)\s*(#.*)?$'),
-        VariableStyle.EXPORT: re.compile(r'^(\s*)export\s+([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*(#.*)?$'),
-        VariableStyle.DECLARE: re.compile(r'^(\s*)declare\s+-x\s+([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*(#.*)?$'),
-        VariableStyle.SETENV: re.compile(r'^(\s*)setenv\s+([A-Za-z_][A-Za-z0-9_]*)\s+(.*?)\s*(#.*)?$'),
-    }
-    
-    # Kommentar-Pattern
-    COMMENT_PATTERN = re.compile(r'^(\s*)#(.*)$')
-    
+    # Kombiniertes Regex für alle Variablendefinitions-Stile.
+    # Der Stil ergibt sich aus dem optionalen Präfix (export/declare -x/setenv);
+    # so genügt ein einziger match()-Aufruf pro Zeile statt vier.
+    _COMBINED = re.compile(
+        r'(?P<ws>\s*)'
+        r'(?P<pfx>export\s+|declare\s+-x\s+|setenv\s+)?'
+        r'(?P<name>[A-Za-z_][A-Za-z0-9_\.]*)'
+        r'(?P<sep>\s*=\s*|\s+)'
+        r'(?P<val>.*?)\s*(?P<cmt>#.*)?'
+    )
+
+    # Zeilenarten in der spaltenweisen Ablage
+    _KIND_VARIABLE = 0
+    _KIND_COMMENT = 1
+    _KIND_EMPTY = 2
+    _KIND_RAW = 3
+
     def __init__(self, preserve_formatting: bool = True, config_file: str = None):
         self.preserve_formatting = preserve_formatting
-        self.variables: Dict[str, ConfigVariable] = {}
-        self.comments: List[ConfigComment] = []
-        self.empty_lines: List[ConfigEmptyLine] = []
-        self.lines: List[Union[ConfigVariable, ConfigComment, ConfigEmptyLine]] = []
         self.file_path: Optional[str] = None
+
+        # Spaltenweise Ablage der geparsten Zeilen (eine Liste pro Feld statt
+        # ein Objekt pro Zeile); die Dataclass-Objekte werden erst bei Zugriff
+        # auf lines/variables/comments/empty_lines erzeugt
+        self._kind: List[int] = []
+        self._name: List[Optional[str]] = []
+        self._value: List[Optional[str]] = []
+        self._style: List[Optional[VariableStyle]] = []
+        self._ws: List[str] = []
+        self._quote: List[str] = []
+        self._comment: List[Optional[str]] = []
+        self._lineno: List[int] = []
+        self._raw: List[str] = []
+        self._var_index: Dict[str, int] = {}
+
+        # Materialisierte Objekt-Sicht; ab der ersten Mutation maßgeblich
+        self._materialized = False
+        self._lines: List[Union[ConfigVariable, ConfigComment, ConfigEmptyLine, ConfigRawLine]] = []
+        self._variables: Dict[str, ConfigVariable] = {}
+
+        # Versionszähler für die abgeleiteten Sichten comments/empty_lines;
+        # jede Mutation erhöht ihn und invalidiert damit die Caches
+        self._version = 0
+        self._comments_cache: Optional[List[ConfigComment]] = None
+        self._comments_version = -1
+        self._empty_lines_cache: Optional[List[ConfigEmptyLine]] = None
+        self._empty_lines_version = -1
+
         if config_file != None:
             self.parse_file(config_file)
-        
+
+    @property
+    def lines(self) -> List[Union[ConfigVariable, ConfigComment, ConfigEmptyLine, ConfigRawLine]]:
+        """Alle Zeilen der Konfiguration als Objekte"""
+        self._materialize()
+        return self._lines
+
+    @lines.setter
+    def lines(self, value: List[Union[ConfigVariable, ConfigComment, ConfigEmptyLine, ConfigRawLine]]) -> None:
+        self._materialize()
+        self._lines = value
+        self._version += 1
+
+    @property
+    def variables(self) -> Dict[str, ConfigVariable]:
+        """Alle Variablen als Dictionary Name -> ConfigVariable"""
+        self._materialize()
+        return self._variables
+
+    @property
+    def comments(self) -> List[ConfigComment]:
+        """Alle Kommentarzeilen (abgeleitete Sicht auf lines)"""
+        if self._comments_cache is None or self._comments_version != self._version:
+            self._comments_cache = [item for item in self.lines
+                                    if isinstance(item, ConfigComment)]
+            self._comments_version = self._version
+        return self._comments_cache
+
+    @property
+    def empty_lines(self) -> List[ConfigEmptyLine]:
+        """Alle Leerzeilen (abgeleitete Sicht auf lines)"""
+        if self._empty_lines_cache is None or self._empty_lines_version != self._version:
+            self._empty_lines_cache = [item for item in self.lines
+                                       if isinstance(item, ConfigEmptyLine)]
+            self._empty_lines_version = self._version
+        return self._empty_lines_cache
+
+    def __getitem__(self, index: int) -> Union[ConfigVariable, ConfigComment, ConfigEmptyLine, ConfigRawLine]:
+        """Gibt die Zeile an der angegebenen Position zurück"""
+        if self._materialized:
+            return self._lines[index]
+        return self._make_line(index)
+
+    def __len__(self) -> int:
+        if self._materialized:
+            return len(self._lines)
+        return len(self._kind)
+
+    def _make_line(self, index: int) -> Union[ConfigVariable, ConfigComment, ConfigEmptyLine, ConfigRawLine]:
+        """Erzeugt das Zeilen-Objekt für eine Spalten-Zeile"""
+        kind = self._kind[index]
+        if kind == self._KIND_VARIABLE:
+            return ConfigVariable(
+                name=self._name[index],
+                value=self._value[index],
+                style=self._style[index],
+                line_number=self._lineno[index],
+                raw_line=self._raw[index],
+                leading_whitespace=self._ws[index],
+                inline_comment=self._comment[index],
+                quote_char=self._quote[index]
+            )
+        if kind == self._KIND_COMMENT:
+            return ConfigComment(
+                content=self._comment[index],
+                line_number=self._lineno[index],
+                raw_line=self._raw[index],
+                is_inline=False
+            )
+        if kind == self._KIND_RAW:
+            return ConfigRawLine(line_number=self._lineno[index], raw_line=self._raw[index])
+        return ConfigEmptyLine(line_number=self._lineno[index], raw_line=self._raw[index])
+
+    def _materialize(self) -> None:
+        """Baut die Objekt-Sicht aus den Spalten auf (einmalig)"""
+        if self._materialized:
+            return
+        self._materialized = True
+        for index in range(len(self._kind)):
+            item = self._make_line(index)
+            self._lines.append(item)
+            if self._kind[index] == self._KIND_VARIABLE:
+                self._variables[item.name] = item
+
     def parse_file(self, file_path: str) -> None:
         """Parst eine Konfigurationsdatei"""
         self.file_path = file_path
         self._reset()
-        
+
         try:
+            # Zeilenweise über das Datei-Objekt iterieren, damit nie die
+            # gesamte Datei als String im Speicher liegt
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.parse_string(content)
+                self._parse_stream(f)
         except FileNotFoundError:
             # Datei existiert nicht, leere Konfiguration
             pass
         except UnicodeDecodeError:
             # Versuche mit anderer Kodierung
+            self._reset()
             with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-            self.parse_string(content)
-    
+                self._parse_stream(f)
+
     def parse_string(self, content: str) -> None:
         """Parst einen String mit Konfigurationsdaten"""
         self._reset()
-        
-        lines = content.splitlines()
+        self._parse_stream(content.splitlines())
+
+    def _parse_stream(self, lines) -> None:
+        """Parst eine Folge von Zeilen (Datei-Objekt oder Liste)"""
+        # Heiße Attribut-Zugriffe einmalig an lokale Namen binden; der
+        # zeilenweise Loop kommt dann mit reinen LOAD_FAST-Zugriffen aus
+        kind_append = self._kind.append
+        name_append = self._name.append
+        value_append = self._value.append
+        style_append = self._style.append
+        ws_append = self._ws.append
+        quote_append = self._quote.append
+        comment_append = self._comment.append
+        lineno_append = self._lineno.append
+        raw_append = self._raw.append
+        var_index = self._var_index
+        parse_variable_line = self._parse_variable_line
+        kind_variable = self._KIND_VARIABLE
+        kind_comment = self._KIND_COMMENT
+        kind_empty = self._KIND_EMPTY
+        kind_raw = self._KIND_RAW
+
         for line_num, line in enumerate(lines, 1):
-            self._parse_line(line.rstrip('\n'), line_num)
-    
-    def _parse_line(self, line: str, line_num: int) -> None:
-        """Parst eine einzelne Zeile"""
-        # Leerzeile
-        if not line.strip():
-            empty_line = ConfigEmptyLine(line_number=line_num, raw_line=line)
-            self.empty_lines.append(empty_line)
-            self.lines.append(empty_line)
-            return
-        
-        # Kommentarzeile
-        comment_match = self.COMMENT_PATTERN.match(line)
-        if comment_match:
-            comment = ConfigComment(
-                content=comment_match.group(2).strip(),
-                line_number=line_num,
-                raw_line=line,
-                is_inline=False
-            )
-            self.comments.append(comment)
-            self.lines.append(comment)
-            return
-        
-        # Versuche verschiedene Variablendefinitionen
-        var = self._parse_variable_line(line, line_num)
-        if var:
-            self.variables[var.name] = var
-            self.lines.append(var)
-        else:
-            # Keine erkannte Syntax, als Kommentar behandeln (oder Originalzeile behalten)
-            comment = ConfigComment(
-                content=f"UNPARSED: {line}",
-                line_number=line_num,
-                raw_line=line,
-                is_inline=False
-            )
-            self.comments.append(comment)
-            self.lines.append(comment)
+            line = line.rstrip('\n')
+            # Leerzeilen und Kommentare ohne Regex erkennen; das deckt den
+            # Großteil typischer Konfigurationsdateien mit reinen str-Aufrufen ab.
+            rest = line.lstrip()
+
+            if not rest:
+                # Leerzeile
+                kind_append(kind_empty)
+                name_append(None)
+                value_append(None)
+                style_append(None)
+                ws_append("")
+                quote_append("")
+                comment_append(None)
+            elif rest.startswith('#'):
+                # Kommentarzeile
+                kind_append(kind_comment)
+                name_append(None)
+                value_append(None)
+                style_append(None)
+                ws_append("")
+                quote_append("")
+                comment_append(rest[1:].strip())
+            else:
+                # Versuche verschiedene Variablendefinitionen
+                parsed = parse_variable_line(line)
+                if parsed:
+                    style, leading_whitespace, name, value, quote_char, comment_content = parsed
+                    # Jede Zeile belegt genau eine Spalten-Zeile, daher
+                    # entspricht der Zeilenindex line_num - 1
+                    var_index[name] = line_num - 1
+                    kind_append(kind_variable)
+                    name_append(name)
+                    value_append(value)
+                    style_append(style)
+                    ws_append(leading_whitespace)
+                    quote_append(quote_char)
+                    comment_append(comment_content)
+                else:
+                    # Keine erkannte Syntax, Originalzeile unverändert behalten
+                    kind_append(kind_raw)
+                    name_append(None)
+                    value_append(None)
+                    style_append(None)
+                    ws_append("")
+                    quote_append("")
+                    comment_append(None)
+            lineno_append(line_num)
+            raw_append(line)
     
-    def _parse_variable_line(self, line: str, line_num: int) -> Optional[ConfigVariable]:
-        """Parst eine Zeile als Variablendefinition"""
-        for style, pattern in self.PATTERNS.items():
-            match = pattern.match(line)
-            if match:
-                leading_whitespace = match.group(1)
-                var_name = match.group(2)
-                var_value = match.group(3).rstrip()
-                inline_comment = match.group(4) if match.group(4) else None
-                
-                # Extrahiere Inline-Kommentar
-                comment_content = None
-                if inline_comment:
-                    comment_content = inline_comment[1:].strip()  # Remove #
-                    # Wenn der Wert selbst ein Kommentarzeichen enthält, müssen wir aufpassen
-                    if '#' in var_value:
-                        # Überprüfe ob # Teil des Wertes ist (in Anführungszeichen)
-                        var_value, comment_content = self._split_value_and_comment(var_value, inline_comment)
-                
-                # Erkenne Anführungszeichen
-                quote_char, unquoted_value = self._extract_quotes(var_value)
-                
-                return ConfigVariable(
-                    name=var_name,
-                    value=unquoted_value,
-                    style=style,
-                    line_number=line_num,
-                    raw_line=line,
-                    leading_whitespace=leading_whitespace,
-                    inline_comment=comment_content,
-                    quote_char=quote_char
-                )
-        
-        return None
+    def _parse_variable_line(
+        self, line: str
+    ) -> Optional[Tuple[VariableStyle, str, str, str, str, Optional[str]]]:
+        """Parst eine Zeile als Variablendefinition.
+
+        Gibt (style, leading_whitespace, name, value, quote_char,
+        inline_comment) zurück oder None, wenn die Zeile keine
+        Variablendefinition ist.
+        """
+        match = self._COMBINED.fullmatch(line)
+        if not match:
+            return None
+
+        prefix = match['pfx']
+        style = _STYLE_BY_PREFIX[prefix.split(None, 1)[0] if prefix else None]
+
+        # setenv trennt Name und Wert mit Leerzeichen, alle anderen mit '='
+        separator = match['sep']
+        if style is VariableStyle.SETENV:
+            if '=' in separator:
+                return None
+        elif '=' not in separator:
+            return None
+
+        var_value = match['val'].rstrip()
+        inline_comment = match['cmt']
+
+        # Extrahiere Inline-Kommentar
+        comment_content = None
+        if inline_comment:
+            comment_content = inline_comment[1:].strip()  # Remove #
+            # Wenn der Wert selbst ein Kommentarzeichen enthält, müssen wir aufpassen
+            if '#' in var_value:
+                # Überprüfe ob # Teil des Wertes ist (in Anführungszeichen)
+                var_value, comment_content = self._split_value_and_comment(var_value, inline_comment)
+
+        # Erkenne Anführungszeichen
+        quote_char, unquoted_value = self._extract_quotes(var_value)
+
+        return (style, match['ws'], match['name'],
+                unquoted_value, quote_char, comment_content)
     
     def _split_value_and_comment(self, value: str, full_comment: str) -> Tuple[str, Optional[str]]:
         """Trennt Wert und Inline-Kommentar, wenn # in Anführungszeichen erscheint"""
-        # Einfache Implementierung: Nehme alles vor dem ersten ungequoteten # als Wert
-        in_single_quote = False
-        in_double_quote = False
-        escaped = False
-        
-        for i, char in enumerate(value):
-            if escaped:
-                escaped = False
-                continue
-                
-            if char == '\\':
-                escaped = True
-                continue
-                
-            if char == "'" and not in_double_quote:
-                in_single_quote = not in_single_quote
-            elif char == '"' and not in_single_quote:
-                in_double_quote = not in_double_quote
-            elif char == '#' and not in_single_quote and not in_double_quote:
+        if _scan_unquoted_hash is not None:
+            # Kompilierter Scanner arbeitet auf Bytes; surrogateescape macht
+            # die Rückumwandlung verlustfrei
+            buf = value.encode('utf-8', 'surrogateescape')
+            index = _scan_unquoted_hash(buf)
+            if index >= 0:
                 # Ungequotetes # gefunden -> hier beginnt Kommentar
-                return value[:i].rstrip(), value[i+1:].strip()
-        
+                return (buf[:index].decode('utf-8', 'surrogateescape').rstrip(),
+                        buf[index + 1:].decode('utf-8', 'surrogateescape').strip())
+            return value, full_comment[1:].strip() if full_comment else None
+
+        # _VALUE_RE konsumiert alles bis zum ersten ungequoteten # in einem
+        # einzigen match() statt Zeichen für Zeichen in Python zu laufen
+        match = _VALUE_RE.match(value)
+        tail = value[match.end():]
+        if tail.startswith('#'):
+            # Ungequotetes # gefunden -> hier beginnt Kommentar
+            return value[:match.end()].rstrip(), tail[1:].strip()
+
         return value, full_comment[1:].strip() if full_comment else None
     
     def _extract_quotes(self, value: str) -> Tuple[str, str]:
         """Extrahiert Anführungszeichen aus einem Wert"""
         if not value:
             return "", value
-        
-        # Prüfe auf einfache Anführungszeichen
-        if value.startswith("'") and value.endswith("'"):
-            return "'", value[1:-1]
-        
-        # Prüfe auf doppelte Anführungszeichen
-        if value.startswith('"') and value.endswith('"'):
-            return '"', value[1:-1]
-        
+
+        # Häufigster Fall zuerst: ein einzelnes Anführungszeichen-Paar;
+        # ein Blick auf das erste Zeichen genügt zur Entscheidung
+        first = value[0]
+        if first in "\"'" and value.endswith(first) and len(value) > 1:
+            return first, value[1:-1]
+
         # Prüfe auf kombinierte Anführungszeichen (selten, aber möglich)
         # Beispiel: '"value"' oder "'value'"
         if len(value) >= 4:
             if (value.startswith("'\"") and value.endswith("\"'")) or \
                (value.startswith('"\'') and value.endswith('\'"')):
                 return value[0:2], value[2:-2]
-        
+
         return "", value
     
     def get(self, name: str, default: Any = None) -> Optional[str]:
         """Gibt den Wert einer Variable zurück"""
-        if name in self.variables:
-            return self.variables[name].get_unquoted_value()
-        return default
+        if self._materialized:
+            if name in self._variables:
+                return self._variables[name].get_unquoted_value()
+            return default
+        index = self._var_index.get(name)
+        if index is None:
+            return default
+        return self._make_line(index).get_unquoted_value()
     
     def set(self, name: str, value: str, style: VariableStyle = VariableStyle.BASH, 
             quote_char: str = "", inline_comment: Optional[str] = None) -> None:
@@ -292,15 +540,17 @@ class BashConfigParser:
             self.variables[name] = var
             # Füge am Ende der Datei hinzu
             self.lines.append(var)
+            self._version += 1
     
     def remove(self, name: str) -> bool:
         """Entfernt eine Variable"""
         if name in self.variables:
-            var = self.variables[name]
-            # Entferne aus der lines-Liste
-            self.lines = [line for line in self.lines if not (isinstance(line, ConfigVariable) and line.name == name)]
-            # Entferne aus dem Dictionary
-            del self.variables[name]
+            var = self.variables.pop(name)
+            # Entferne genau dieses Objekt aus der lines-Liste; der
+            # Identitätsvergleich von list.remove erspart das Umkopieren
+            # der gesamten Liste
+            self.lines.remove(var)
+            self._version += 1
             return True
         return False
     
@@ -311,36 +561,77 @@ class BashConfigParser:
                 raise ValueError("Keine Datei angegeben")
             file_path = self.file_path
         
-        lines = []
-        for item in self.lines:
-            lines.append(str(item))
-        
-        content = '\n'.join(lines)
-        
-        # Backup der originalen Datei erstellen
+        content = self.to_bytes()
+
+        # Backup der originalen Datei erstellen; copyfile kopiert im Kernel
+        # (sendfile), ohne die Datei durch einen Python-String zu schleusen
         if os.path.exists(file_path):
-            backup_path = f"{file_path}.bak"
             try:
-                with open(file_path, 'r', encoding='utf-8') as src:
-                    with open(backup_path, 'w', encoding='utf-8') as dst:
-                        dst.write(src.read())
-            except:
+                shutil.copyfile(file_path, f"{file_path}.bak")
+            except OSError:
                 pass
-        
-        # Neue Datei schreiben
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+
+        # Zugriffsrechte der bestehenden Datei übernehmen; NamedTemporaryFile
+        # legt mit 0600 an, was z.B. /etc/sysconfig-Dateien für alle anderen
+        # Leser unlesbar machen würde
+        try:
+            file_mode = stat.S_IMODE(os.stat(file_path).st_mode)
+        except OSError:
+            file_mode = 0o644
+
+        # Neue Datei erst als Temporärdatei schreiben und dann atomar
+        # umbenennen, damit die Zieldatei bei Schreibfehlern intakt bleibt
+        tmp = tempfile.NamedTemporaryFile(
+            mode='wb', delete=False,
+            dir=os.path.dirname(file_path) or '.')
+        try:
+            with tmp:
+                tmp.write(content)
+            os.chmod(tmp.name, file_mode)
+            os.replace(tmp.name, file_path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
     
     def to_string(self) -> str:
         """Gibt die Konfiguration als String zurück"""
+        if self._materialized:
+            # map(str, ...) hält die Iteration komplett in C
+            return '\n'.join(map(str, self._lines))
+
+        # Direkt aus den Spalten rendern, ohne Zeilen-Objekte zu erzeugen
+        prefixes = ConfigVariable._PREFIX
+        separators = ConfigVariable._SEP
         lines = []
-        for item in self.lines:
-            lines.append(str(item))
+        for index, kind in enumerate(self._kind):
+            if kind == self._KIND_VARIABLE:
+                style = self._style[index]
+                quote = self._quote[index]
+                comment = self._comment[index]
+                comment_part = f"  # {comment}" if comment else ""
+                lines.append(
+                    f"{self._ws[index]}{prefixes[style]}{self._name[index]}"
+                    f"{separators.get(style, '=')}{quote}{self._value[index]}{quote}"
+                    f"{comment_part}")
+            elif kind == self._KIND_COMMENT:
+                lines.append(self._raw[index].rstrip())
+            elif kind == self._KIND_RAW:
+                lines.append(self._raw[index])
+            else:
+                lines.append("")
         return '\n'.join(lines)
+
+    def to_bytes(self) -> bytes:
+        """Gibt die Konfiguration als UTF-8-Bytes zurück"""
+        # Immer aus to_string() abgeleitet, damit beide nie auseinanderlaufen
+        return self.to_string().encode('utf-8')
     
     def get_all_variables(self) -> Dict[str, str]:
         """Gibt alle Variablen als Dictionary zurück"""
-        return {name: var.get_unquoted_value() for name, var in self.variables.items()}
+        if self._materialized:
+            return {name: var.get_unquoted_value() for name, var in self._variables.items()}
+        return {name: self._make_line(index).get_unquoted_value()
+                for name, index in self._var_index.items()}
     
     def add_comment(self, comment: str, position: Optional[int] = None) -> None:
         """Fügt einen Kommentar hinzu"""
@@ -356,8 +647,7 @@ class BashConfigParser:
             self.lines.append(comment_obj)
         else:
             self.lines.insert(position, comment_obj)
-        
-        self.comments.append(comment_obj)
+        self._version += 1
     
     def add_empty_line(self, position: Optional[int] = None) -> None:
         """Fügt eine leere Zeile hinzu"""
@@ -367,20 +657,30 @@ class BashConfigParser:
             self.lines.append(empty_line)
         else:
             self.lines.insert(position, empty_line)
-        
-        self.empty_lines.append(empty_line)
+        self._version += 1
     
     def _reset(self) -> None:
         """Setzt den Parser zurück"""
-        self.variables.clear()
-        self.comments.clear()
-        self.empty_lines.clear()
-        self.lines.clear()
+        self._kind.clear()
+        self._name.clear()
+        self._value.clear()
+        self._style.clear()
+        self._ws.clear()
+        self._quote.clear()
+        self._comment.clear()
+        self._lineno.clear()
+        self._raw.clear()
+        self._var_index.clear()
+        self._materialized = False
+        self._lines.clear()
+        self._variables.clear()
+        self._version += 1
+        self._comments_cache = None
+        self._empty_lines_cache = None
     
     def validate_variable_name(self, name: str) -> bool:
         """Validiert einen Variablennamen"""
-        pattern = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
-        return bool(pattern.match(name))
+        return bool(_NAME_RE.fullmatch(name))
 
 
 # Hilfsfunktionen für häufige Aufgaben